@@ -2,6 +2,7 @@
 from logging import raiseExceptions
 import numpy as np
 import warnings
+from frames import chord_frames, generate_normal
 
 class FoilProfile():
     def __init__(self, filename, skiprows=1):
@@ -52,29 +53,17 @@ class WingSection():
     def transform(self, lead_pos, trail_pos, normal_vect):
 
         trail_pos, lead_pos = np.array(trail_pos), np.array(lead_pos)
-        if trail_pos.size != 3 or lead_pos.size != 3 or lead_pos.size != 3 :
+        if trail_pos.size != 3 or lead_pos.size != 3 or np.size(normal_vect) != 3 :
             raise ValueError("Wrong number of coordinates, please provide 3D space vectors")
 
+        new_chord, new_local_basis = chord_frames(lead_pos.reshape(1,3), trail_pos.reshape(1,3),
+                                                  np.reshape(normal_vect, (1,3)))
+        self.set_frame(lead_pos, new_chord[0], new_local_basis[0])
 
-        new_chord_vect = np.array(trail_pos) - np.array(lead_pos)
-        new_chord = np.linalg.norm(new_chord_vect)
-        if new_chord < 0.05 :
-            warnings.warn("This section is really small (<0.05 mm), Freecad may not be able to build it", RuntimeWarning)
-
-        new_chord_vect = new_chord_vect/new_chord
-
-        new_normal_vect = np.array(normal_vect)
-        new_normal_vect = new_normal_vect/np.linalg.norm(new_normal_vect)
-
-        if 0.0001 < abs(np.dot(new_normal_vect, new_chord_vect)):
-            raise ValueError("normal vector is not normal to the chord")
-
-        new_thick_vect = np.cross(new_chord_vect,new_normal_vect)
-        new_thick_vect = new_thick_vect/np.linalg.norm(new_thick_vect)
-
-        new_local_basis = np.column_stack((new_chord_vect,new_normal_vect, new_thick_vect))
-
-
+    def set_frame(self, lead_pos, new_chord, new_local_basis):
+        """ Place the section from a precomputed chord length and local basis,
+        as given by frames.chord_frames.
+        """
 
         # transform
         # P_o1 P_12 P_1o V_o = P_o2 P_o1_inv V_o
@@ -89,52 +78,92 @@ class WingSection():
         # do not change the order
         self.lead_pos = self.xyz[self.base_prof.leading_edge_idx,:]
         self.trail_pos = self.xyz[self.base_prof.trailing_edge_idx,:]
-        self.translate_lead(lead_pos)
+        self.translate_lead(np.array(lead_pos))
 
 
     def scale(self, factor):
+        # In place, lead_pos and trail_pos stay views of xyz
         l_pos = self.lead_pos.copy()
-        self.xyz = self.xyz*factor
+        self.xyz *= factor
         self.translate_lead(l_pos)
-        # Update
-        self.trail_pos = self.xyz[self.base_prof.trailing_edge_idx,:]
-        self.lead_pos = self.xyz[self.base_prof.leading_edge_idx,:]
 
     def translate_lead(self, new_lead_pos):
-        self.xyz = self.xyz+(new_lead_pos - self.lead_pos)
-        # Update
-        self.lead_pos = self.xyz[self.base_prof.leading_edge_idx,:]
-        self.trail_pos = self.xyz[self.base_prof.trailing_edge_idx,:]
-
-
-def generate_normal(lead_pos, trail_pos):
-    trail_pos, lead_pos = np.array(trail_pos), np.array(lead_pos)
-
-    if trail_pos.size != lead_pos.size:
-        raise ValueError("Arguments shapes don't match")
-
-    if trail_pos.shape[1] != 3 or lead_pos.shape[1] != 3:
-        raise ValueError("Wrong number of coordinates, please provide set of n 3D space coordinates : (n, 3)")
-
-    if lead_pos.shape[0] < 2 :
-        raise ValueError("Please provide more than one couple of coordinates")
-
-    lead_pos, trail_pos = np.array(lead_pos), np.array(trail_pos)
-    chord_vect = (trail_pos-lead_pos)/np.linalg.norm(trail_pos-lead_pos, axis=1,keepdims=True)
-    center_pos = (lead_pos+trail_pos)/2
-    norm_vect = np.zeros_like(lead_pos)
-
-    if norm_vect.shape[0] == 2 :
-        norm_vect[:,:] = (center_pos[1,:]-center_pos[0,:])[np.newaxis,:]
-    else :
-        norm_vect[1:-1,:] = center_pos[2:,:]-center_pos[:-2]
-        norm_vect[0,:] = center_pos[1,:]-center_pos[0,:]
-        norm_vect[-1,:] = center_pos[-1,:]-center_pos[-3,:]
-
-    norm_vect = norm_vect - chord_vect*(np.sum(chord_vect*norm_vect,axis=1,keepdims=True))
-    norm_vect /= np.linalg.norm(norm_vect,axis=1,keepdims=True)
-
-    return norm_vect
+        self.xyz += new_lead_pos - self.lead_pos
+
+
+class SectionSet():
+    """ Compact storage of many wing sections.
+    Each FoilProfile is stored once, as a unit chord profile in its own local basis,
+    and each section (station) only keeps its profile index, chord, local basis and
+    leading edge position in a structured array.
+    The sections coordinates are computed on demand.
+    """
+
+    station_dtype = np.dtype([("profile", np.intp),
+                              ("chord", np.float64),
+                              ("basis", np.float64, (3,3)),
+                              ("lead_pos", np.float64, (3,))])
+
+    def __init__(self):
+        self.base_profiles = []
+        self.unit_xyz = []
+        self._profile_idx = {}
+        self.stations = np.zeros(0, dtype=self.station_dtype)
+
+    def __len__(self):
+        return self.stations.shape[0]
+
+    def add_profile(self, base_profile):
+        """ Return the index of the profile, storing it if it is new."""
+        key = id(base_profile)
+        if key not in self._profile_idx:
+            sec = WingSection(base_profile)
+            # Unit chord profile expressed in its local basis, leading edge at the origin
+            unit_xyz = (sec.xyz - sec.lead_pos)@sec.local_basis/sec.chord
+            self._profile_idx[key] = len(self.base_profiles)
+            self.base_profiles += [base_profile]
+            self.unit_xyz += [unit_xyz]
+        return self._profile_idx[key]
+
+    def add_sections(self, base_profiles, lead_pos, chords, bases):
+        """ Append sections from their profiles and frames, as given by frames.chord_frames."""
+        new = np.zeros(len(chords), dtype=self.station_dtype)
+        new["profile"] = [self.add_profile(prof) for prof in base_profiles]
+        new["chord"] = chords
+        new["basis"] = bases
+        new["lead_pos"] = lead_pos
+        self.stations = np.concatenate((self.stations, new))
+
+    def section_xyz(self, i):
+        """ Return the coordinates of the section i."""
+        st = self.stations[i]
+        return st["lead_pos"] + st["chord"]*self.unit_xyz[st["profile"]]@st["basis"].T
+
+    def iter_xyz(self, chunk_size=64):
+        """ Yield the profile and the coordinates of each section in order.
+        The coordinates are computed by chunks of *chunk_size* sections,
+        so that only one chunk is stored in memory at a time.
+        """
+        for start in range(0, len(self), chunk_size):
+            chunk = self.stations[start:start+chunk_size]
+            chunk_xyz = [None]*chunk.shape[0]
+            for p in np.unique(chunk["profile"]):
+                idx = np.flatnonzero(chunk["profile"] == p)
+                xyz = np.einsum("nij,pj->npi", chunk["basis"][idx], self.unit_xyz[p])
+                xyz = chunk["lead_pos"][idx,np.newaxis,:] + chunk["chord"][idx,np.newaxis,np.newaxis]*xyz
+                for k, j in enumerate(idx):
+                    chunk_xyz[j] = xyz[k]
+            for st, xyz in zip(chunk, chunk_xyz):
+                yield self.base_profiles[st["profile"]], xyz
+
+    def edges(self):
+        """ Return the leading and trailing edges positions of all the sections."""
+        trail_pos = np.zeros((len(self),3))
+        for p, unit_xyz in enumerate(self.unit_xyz):
+            idx = np.flatnonzero(self.stations["profile"] == p)
+            unit_trail = unit_xyz[self.base_profiles[p].trailing_edge_idx]
+            trail_pos[idx] = self.stations["chord"][idx,np.newaxis]*(self.stations["basis"][idx]@unit_trail)
+        return self.stations["lead_pos"].copy(), self.stations["lead_pos"] + trail_pos
 
 
 def test_foilProfile():
@@ -11,6 +11,7 @@ import Draft
 import Part
 import numpy as np
 from wing import Wing
+from frames import plane_frames
 
 
 def face_sections(plane1_param, face2, space, min_tip_distance, height):
@@ -40,14 +41,7 @@ def face_sections(plane1_param, face2, space, min_tip_distance, height):
     center = np.array([center.x,center.y,center.z])
 
     # making the next section plane perpendicular to face2
-    new_normal = plane1_normal-face2_normal*np.dot(face2_normal, plane1_normal)
-    new_normal /= np.linalg.norm(new_normal)
-
-    xaxis = np.cross(face2_normal, new_normal)
-    xaxis /= np.linalg.norm(xaxis)
-    zaxis = face2_normal
-    zaxis = np.cross(xaxis,new_normal)
-    zaxis /= np.linalg.norm(zaxis)
+    new_normal, xaxis, zaxis = plane_frames(plane1_normal, face2_normal)
 
     if not face2.isInside(Vector(*center),0.00001,True):
         doc = FreeCAD.ActiveDocument
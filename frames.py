@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+#
+# This module contain functions to compute the local frames
+# (orthonormal bases) of all the wing sections at once.
+#
+import numpy as np
+import warnings
+
+
+def _as_vectors(vects, name="vectors"):
+    vects = np.array(vects, dtype=float)
+    if vects.ndim != 2 or vects.shape[1] != 3:
+        raise ValueError(f"Wrong number of coordinates for {name}, please provide set of n 3D space coordinates : (n, 3)")
+    return vects
+
+
+def normalize(vects, name="vectors"):
+    """ Return the unit vectors of a (n, 3) array, raise if one of them is null."""
+    norm = np.linalg.norm(vects, axis=1, keepdims=True)
+    null = np.flatnonzero(norm[:,0] < 1e-12)
+    if null.size > 0:
+        raise ValueError(f"Null {name} at stations {null.tolist()}")
+    return vects/norm
+
+
+def check_orthogonal(vects_a, vects_b, tol=0.0001, msg="vectors are not orthogonal"):
+    """ Raise a ValueError if any couple of unit vectors is not orthogonal."""
+    dots = np.abs(np.sum(vects_a*vects_b, axis=1))
+    wrong = np.flatnonzero(dots > tol)
+    if wrong.size > 0:
+        raise ValueError(f"{msg} at stations {wrong.tolist()}")
+
+
+def smooth_span(vects, passes=1):
+    """ Smooth a set of vectors along the span with a [1/4, 1/2, 1/4] moving average.
+    The first and last stations are kept unchanged.
+    """
+    vects = np.array(vects, dtype=float)
+    for i in range(passes):
+        vects[1:-1,:] = 0.25*vects[:-2,:] + 0.5*vects[1:-1,:] + 0.25*vects[2:,:]
+    return vects
+
+
+def generate_normal(lead_pos, trail_pos):
+    """ Generate the sections normals from the leading and trailing edges positions.
+    The normals follow the span-wise direction of the chords centers,
+    and are made perpendicular to the chords.
+    """
+    trail_pos, lead_pos = np.array(trail_pos), np.array(lead_pos)
+
+    if trail_pos.size != lead_pos.size:
+        raise ValueError("Arguments shapes don't match")
+
+    if trail_pos.shape[1] != 3 or lead_pos.shape[1] != 3:
+        raise ValueError("Wrong number of coordinates, please provide set of n 3D space coordinates : (n, 3)")
+
+    if lead_pos.shape[0] < 2 :
+        raise ValueError("Please provide more than one couple of coordinates")
+
+    chord_vect = (trail_pos-lead_pos)/np.linalg.norm(trail_pos-lead_pos, axis=1,keepdims=True)
+    center_pos = (lead_pos+trail_pos)/2
+    norm_vect = np.zeros_like(lead_pos, dtype=float)
+
+    if norm_vect.shape[0] == 2 :
+        norm_vect[:,:] = (center_pos[1,:]-center_pos[0,:])[np.newaxis,:]
+    else :
+        norm_vect[1:-1,:] = center_pos[2:,:]-center_pos[:-2]
+        norm_vect[0,:] = center_pos[1,:]-center_pos[0,:]
+        norm_vect[-1,:] = center_pos[-1,:]-center_pos[-3,:]
+
+    norm_vect = norm_vect - chord_vect*(np.sum(chord_vect*norm_vect,axis=1,keepdims=True))
+    norm_vect /= np.linalg.norm(norm_vect,axis=1,keepdims=True)
+
+    return norm_vect
+
+
+def chord_frames(lead_pos, trail_pos, normals=None, orientation=1, smoothing=0, tol=0.0001):
+    """ Compute the chord lengths (n,) and the local bases (n, 3, 3) of n sections.
+    The columns of each basis are the chord, normal and thickness unit vectors.
+
+    If no normals are provided they are generated from the edges positions.
+    *smoothing* is the number of span-wise smoothing passes applied to the normals,
+    which are then made perpendicular to the chords again.
+    """
+    lead_pos = _as_vectors(lead_pos, "leading edge positions")
+    trail_pos = _as_vectors(trail_pos, "trailing edge positions")
+    if lead_pos.shape != trail_pos.shape:
+        raise ValueError("Arguments shapes don't match")
+
+    chord_vect = trail_pos - lead_pos
+    chord = np.linalg.norm(chord_vect, axis=1)
+    if np.any(chord < 0.05):
+        small = np.flatnonzero(chord < 0.05)
+        warnings.warn(f"Sections {small.tolist()} are really small (<0.05 mm), Freecad may not be able to build them", RuntimeWarning)
+    chord_vect = normalize(chord_vect, "chord")
+
+    if normals is None:
+        norm_vect = generate_normal(lead_pos, trail_pos)
+    else:
+        norm_vect = normalize(_as_vectors(normals, "normals"), "normal")
+        if norm_vect.shape != chord_vect.shape:
+            raise ValueError("Arguments shapes don't match")
+        check_orthogonal(norm_vect, chord_vect, tol, "normal vector is not normal to the chord")
+    norm_vect = orientation*norm_vect
+
+    if smoothing > 0:
+        norm_vect = smooth_span(norm_vect, smoothing)
+        norm_vect = norm_vect - chord_vect*np.sum(chord_vect*norm_vect, axis=1, keepdims=True)
+        norm_vect = normalize(norm_vect, "smoothed normal")
+
+    thick_vect = normalize(np.cross(chord_vect, norm_vect), "thickness vector")
+
+    return chord, np.stack((chord_vect, norm_vect, thick_vect), axis=2)
+
+
+def plane_frames(plane_normals, face_normals):
+    """ Compute the frames of section planes made perpendicular to a surface.
+    Return the new planes normals, and the x and z axis lying in the planes,
+    the x axis being tangent to the surface.
+    Accept single 3D vectors or sets of n vectors (n, 3).
+    """
+    single = np.ndim(plane_normals) == 1
+    plane_normals = _as_vectors(np.atleast_2d(plane_normals), "plane normals")
+    face_normals = _as_vectors(np.atleast_2d(face_normals), "face normals")
+
+    # Removing the component of the plane normal along the face normal
+    new_normal = plane_normals - face_normals*np.sum(face_normals*plane_normals, axis=1, keepdims=True)
+    new_normal = normalize(new_normal, "section plane normal (plane parallel to the face)")
+
+    xaxis = normalize(np.cross(face_normals, new_normal), "x axis")
+    zaxis = normalize(np.cross(xaxis, new_normal), "z axis")
+
+    if single:
+        return new_normal[0], xaxis[0], zaxis[0]
+    return new_normal, xaxis, zaxis
@@ -3,17 +3,22 @@ from FreeCAD import Vector
 import numpy as np
 from sys import path
 path.append('/home/tugdual/cad/Cadwing')
-from airfoil import WingSection, FoilProfile, generate_normal
+from airfoil import WingSection, FoilProfile, SectionSet
+from frames import chord_frames
 import Draft
 import Sketcher
 import Part
 
 class Wing(object):
-    def __init__(self, doc,name="wing"):
+    def __init__(self, doc,name="wing", compact=False):
         self.name = name
         self.baseprofiles = {}
         self.shape = None
         self.sections = []
+        # With compact=True the sections are stored as frames in a SectionSet
+        # and their coordinates are only computed when building the shapes
+        self.compact = compact
+        self.section_set = SectionSet()
         self.doc = doc
 
 
@@ -22,23 +27,34 @@ class Wing(object):
             foil_name = filename
         self.baseprofiles[foil_name] = FoilProfile(filename)
 
-    def add_sections(self, profile_names, lead_pos, trail_pos, orientation = 1, normals = None):
+    def add_sections(self, profile_names, lead_pos, trail_pos, orientation = 1, normals = None, smoothing = 0):
 
-        if normals == None:
-            normal_vects = orientation*generate_normal(lead_pos, trail_pos)
-        else :
-            normal_vects = orientation*normals
+        # All the sections frames are computed at once
+        chords, bases = chord_frames(lead_pos, trail_pos, normals, orientation, smoothing)
 
-        for name, l_pos, t_pos, normal in zip(profile_names, lead_pos, trail_pos, normal_vects):
+        if self.compact:
+            profiles = [self.baseprofiles[name] for name in profile_names]
+            self.section_set.add_sections(profiles, lead_pos, chords, bases)
+            return
+
+        for name, l_pos, chord, basis in zip(profile_names, lead_pos, chords, bases):
             sec = WingSection(self.baseprofiles[name])
-            sec.transform(l_pos, t_pos, normal)
+            sec.set_frame(l_pos, chord, basis)
             self.sections += [sec]
 
+    def iter_sections(self):
+        """ Yield the base profile and the coordinates of each section."""
+        if self.compact:
+            yield from self.section_set.iter_xyz()
+        else:
+            for sec in self.sections:
+                yield sec.base_prof, sec.xyz
+
     def make_part_sections(self):
         polygon_sections =  []
-        for i, sec in enumerate(self.sections):
+        for i, (base_prof, xyz) in enumerate(self.iter_sections()):
             points = []
-            for pt in sec.xyz:
+            for pt in xyz:
                 points += [Vector(pt[0], pt[1], pt[2])]
             poly_section = Part.makePolygon(points)
             polygon_sections +=  [poly_section]
@@ -46,9 +62,9 @@ class Wing(object):
 
     def make_spline_sections(self):
         spline_sections =  []
-        for i, sec in enumerate(self.sections):
+        for i, (base_prof, xyz) in enumerate(self.iter_sections()):
             points = []
-            for pt in sec.xyz:
+            for pt in xyz:
                 points += [Vector(pt[0], pt[1], pt[2])]
 
             spline = Part.BSplineCurve()
@@ -60,7 +76,7 @@ class Wing(object):
 
     def make_spline_sections_segmented(self, n_segments=0):
         spline_sections =  []
-        for i, sec in enumerate(self.sections):
+        for i, (base_prof, xyz) in enumerate(self.iter_sections()):
             # points = []
             # for pt in sec.xyz:
             #     points += [Vector(pt[0], pt[1], pt[2])]
@@ -71,13 +87,13 @@ class Wing(object):
             splines = []
             # lenght of the extrado segments
 
-            l_idx = sec.base_prof.leading_edge_idx
+            l_idx = base_prof.leading_edge_idx
             l_extrdo = l_idx/n_segments
-            l_intrdo = (sec.xyz.shape[0]- l_idx)/n_segments
+            l_intrdo = (xyz.shape[0]- l_idx)/n_segments
 
             for j in range(n_segments):
                 points = []
-                for pt in sec.xyz[int(j*l_extrdo) : int((j+1)*l_extrdo)+1]:
+                for pt in xyz[int(j*l_extrdo) : int((j+1)*l_extrdo)+1]:
                     points += [Vector(pt[0], pt[1], pt[2])]
 
                 spl = Part.BSplineCurve()
@@ -85,7 +101,7 @@ class Wing(object):
                 splines += [spl]
 
                 points = []
-                for pt in sec.xyz[l_idx+int(j*l_intrdo): l_idx + int((j+1)*l_intrdo)+1-(j+1)//n_segments]:
+                for pt in xyz[l_idx+int(j*l_intrdo): l_idx + int((j+1)*l_intrdo)+1-(j+1)//n_segments]:
                     points += [Vector(pt[0], pt[1], pt[2])]
 
                 spl = Part.BSplineCurve()